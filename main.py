@@ -1,8 +1,23 @@
 from tkinter import *
 from tkinter import messagebox
+from functools import lru_cache
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from numpy import *
+import numpy as np
+
+FUNCTION_NAMESPACE = {name: getattr(np, name) for name in np.__all__}
+FUNCTION_NAMESPACE['np'] = np
+
+SAMPLES_PER_PIXEL = 3
+DEFAULT_BOUNDS = (-50.0, 50.0, -50.0, 50.0)
+PLOT_ERROR_MESSAGE = 'An error occurred while plotting\nPlease check the limits and the function'
+MOVE_STEP = 10
+ZOOM_STEP = 10
+ZOOM_IN_DELTA = np.array([ZOOM_STEP, -ZOOM_STEP, ZOOM_STEP, -ZOOM_STEP], dtype=float)
+
+@lru_cache(maxsize=64)
+def compile_function(func):
+    return compile(func, "<function>", "eval")
 
 class App:
     def __init__(self):
@@ -12,14 +27,22 @@ class App:
         
         self.font = ("Verdana", 10)
         self.plot_button_font = ("Verdana", 16, "bold")
+        self.button_style = {"bg": "#20221f", "fg": "white", "relief": "raised",
+                             "activebackground": "#383737", "activeforeground": "white"}
         
         self.colors = ['red', 'blue', 'green', 'black', 'yellow', 'grey']
         self.color = StringVar()
-        self.x_min = DoubleVar(value=-50)
-        self.y_min = DoubleVar(value=-50)
-        self.x_max = DoubleVar(value=50)
-        self.y_max = DoubleVar(value=50)
         self.function = StringVar()
+        self.function.trace_add("write", self.update_function)
+        self.function_text = ""
+        self.cached_function = None
+        self.resize_buffers(0)
+        self.bounds = np.array(DEFAULT_BOUNDS)
+        self.bounds_edited = False
+        self.shown_bounds = np.full(4, np.nan)
+        self.drawn_bounds = None
+        self.drawn_line = None
+        self.pending_redraw_id = None
         
         self.plot_frame = self.create_frame()
         self.canvas = self.create_canvas()
@@ -35,10 +58,14 @@ class App:
     
     def create_canvas(self):
         figure = Figure(figsize=(5, 5), dpi=100)
-        ax = figure.add_subplot(111)
-        ax.plot([], [])
+        self.axes = figure.add_subplot(111)
+        self.axis_lines = (self.axes.axhline(color='black', lw=0.5, visible=False),
+                           self.axes.axvline(color='black', lw=0.5, visible=False))
+        self.plot_line, = self.axes.plot([], [], animated=True)
+        self.background = None
         
         canvas = FigureCanvasTkAgg(figure, self.plot_frame)
+        canvas.mpl_connect('draw_event', self.on_draw)
         canvas.draw()
         canvas.get_tk_widget().pack(side="bottom", fill="both", expand=True)
         canvas._tkcanvas.pack(side="top", fill="both", expand=True)
@@ -62,25 +89,28 @@ class App:
         third_row.pack_propagate(False)
         third_row.pack(expand=True, side="bottom")
         
-        button_plot = Button(third_row, font=self.plot_button_font, text="PLOT", width=10, height=2, bg="#20221f",
-                                fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                command=self.plot)
+        button_plot = Button(third_row, font=self.plot_button_font, text="PLOT", width=10, height=2,
+                             command=self.plot, **self.button_style)
         button_plot.grid(row=0, column=0, padx=0, pady=0, columnspan=1, sticky="EWNS")
         
         labels = [
-            (first_row, "X min:", self.x_min),
-            (first_row, "Y min:", self.y_min),
-            (second_row, "X max:", self.x_max),
-            (second_row, "Y max:", self.y_max)
+            (first_row, "X min:", 0),
+            (first_row, "Y min:", 2),
+            (second_row, "X max:", 1),
+            (second_row, "Y max:", 3)
         ]
         
-        for frame, text, var in labels:
+        self.bound_entries = [None] * 4
+        mark_bounds_edited = self.window.register(self.mark_bounds_edited)
+        for frame, text, index in labels:
             label = Label(frame, font=self.font, text=text, width=6, height=2, bg="#20221f", fg="white",
                              activeforeground="white")
             label.pack(side="left", padx=3)
             
-            entry = Entry(frame, width=6, textvariable=var)
+            entry = Entry(frame, width=6, validate="key", validatecommand=mark_bounds_edited)
             entry.pack(side="left", padx=3)
+            self.bound_entries[index] = entry
+        self.show_bounds()
         
         Label(first_row, font=self.font, text="Function: y=", width=10, height=2, bg="#20221f", fg="white",
                  activeforeground="white").pack(side="left", padx=3)
@@ -92,92 +122,169 @@ class App:
         spinbox.config(state="readonly", background="#20221f", foreground="#20221f")
         spinbox.pack(side="left", padx=3)
 
-        move_up_button = Button(second_row, text="↑", width=3, height=1, bg="#20221f",
-                                   fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                   command=self.move_up)
-        move_up_button.pack(side="left", padx=3)
+        view_buttons = [
+            ("↑", None, self.move_up),
+            ("↓", None, self.move_down),
+            ("←", None, self.move_left),
+            ("→", None, self.move_right),
+            ("+", self.font, self.zoom_in),
+            ("-", self.font, self.zoom_out)
+        ]
+        
+        for text, font, command in view_buttons:
+            button = Button(second_row, font=font, text=text, width=3, height=1, command=command, **self.button_style)
+            button.pack(side="left", padx=3)
+        
+        copyright_label = Label(self.plot_frame, text="© Oleksandr Herasymov", font=("Verdana", 8), bg="#20221f", fg="white")
+        copyright_label.pack(side="bottom", pady=5)
 
-        move_down_button = Button(second_row, text="↓", width=3, height=1, bg="#20221f",
-                                     fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                     command=self.move_down)
-        move_down_button.pack(side="left", padx=3)
+    def update_function(self, *args):
+        self.function_text = self.function.get().strip()
 
-        move_left_button = Button(second_row, text="←", width=3, height=1, bg="#20221f",
-                                     fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                     command=self.move_left)
-        move_left_button.pack(side="left", padx=3)
+    def mark_bounds_edited(self):
+        self.bounds_edited = True
+        return True
 
-        move_right_button = Button(second_row, text="→", width=3, height=1, bg="#20221f",
-                                      fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                      command=self.move_right)
-        move_right_button.pack(side="left", padx=3)
+    def show_bounds(self):
+        edited = self.bounds_edited
+        for entry, value, shown in zip(self.bound_entries, self.bounds, self.shown_bounds):
+            if value != shown:
+                entry.delete(0, END)
+                entry.insert(0, f"{value:.10g}")
+        self.shown_bounds = self.bounds.copy()
+        self.bounds_edited = edited
 
-        zoom_in_button = Button(second_row, font=self.font, text="+", width=3, height=1, bg="#20221f",
-                                   fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                   command=self.zoom_in)
-        zoom_in_button.pack(side="left", padx=3)
+    def schedule_redraw(self):
+        if self.pending_redraw_id is None:
+            self.pending_redraw_id = self.window.after(16, self.redraw)
 
-        zoom_out_button = Button(second_row, font=self.font, text="-", width=3, height=1, bg="#20221f",
-                                    fg="white", relief="raised", activebackground="#383737", activeforeground="white",
-                                    command=self.zoom_out)
-        zoom_out_button.pack(side="left", padx=3)
-        
-        copyright_label = Label(self.plot_frame, text="© Oleksandr Herasymov", font=("Verdana", 8), bg="#20221f", fg="white")
-        copyright_label.pack(side="bottom", pady=5)
+    def read_bounds(self):
+        try:
+            bounds = np.array([float(entry.get()) for entry in self.bound_entries])
+            if not np.isfinite(bounds).all():
+                raise ValueError
+        except ValueError:
+            messagebox.showerror('Error', PLOT_ERROR_MESSAGE)
+            return False
+        self.bounds[:] = bounds
+        self.bounds_edited = False
+        return True
 
     def plot(self):
+        if self.read_bounds():
+            self.redraw()
+
+    def redraw(self):
+        if self.pending_redraw_id is not None:
+            self.window.after_cancel(self.pending_redraw_id)
+            self.pending_redraw_id = None
+        
         color = self.color.get()
-        func = self.function.get()
+        func = self.function_text
+        same_bounds = np.array_equal(self.bounds, self.drawn_bounds)
+        if same_bounds and (func, color) == self.drawn_line:
+            return
         
-        try:
-            x = arange(int(self.x_min.get()), int(self.x_max.get()) + 1, 0.1)
-            y = eval(func)
-        except:
-            messagebox.showerror('Error', 'An error occured while plotting\nPlease the check the limits and the function')
-        
-        self.canvas.figure.clear()
-        ax = self.canvas.figure.add_subplot(111)
-        ax.set_xlim([self.x_min.get(), self.x_max.get()])
-        ax.set_ylim([self.y_min.get(), self.y_max.get()])
-        ax.axhline(color='black', lw=0.5)
-        ax.axvline(color='black', lw=0.5)
-        ax.plot(x, y, color=color)
-        self.canvas.draw()
+        x_min, x_max, y_min, y_max = self.bounds
+        self.show_bounds()
+        
+        x = y = ()
+        if func:
+            try:
+                x, y = self.sample(func, x_min, x_max)
+            except:
+                messagebox.showerror('Error', PLOT_ERROR_MESSAGE)
+                return
+        
+        self.plot_line.set_data(x, y)
+        self.plot_line.set_color(color)
+        if self.background is not None and not self.axes.stale and same_bounds:
+            self.canvas.restore_region(self.background)
+            self.axes.draw_artist(self.plot_line)
+            self.canvas.blit(self.axes.bbox)
+        else:
+            for line in self.axis_lines:
+                line.set_visible(True)
+            self.axes.set_xlim(x_min, x_max, emit=False)
+            self.axes.set_ylim(y_min, y_max, emit=False)
+            self.canvas.draw_idle()
+        self.drawn_bounds = self.bounds.copy()
+        self.drawn_line = (func, color)
+
+    def on_draw(self, event):
+        self.background = event.canvas.copy_from_bbox(self.axes.bbox)
+        self.axes.draw_artist(self.plot_line)
+        event.canvas.blit(self.axes.bbox)
+
+    def resize_buffers(self, count):
+        self.unit_grid = np.linspace(0.0, 1.0, count)
+        self.cached_x = np.empty(count)
+        self.cached_y = np.empty(count)
+        self.cached_mask = np.empty(count, dtype=bool)
+
+    def sample(self, func, x_min, x_max):
+        count = 2 * SAMPLES_PER_PIXEL * max(int(self.axes.bbox.width), 100)
+        if (func != self.cached_function or count != len(self.cached_x)
+                or x_min < self.cached_x[0] or x_max > self.cached_x[-1]
+                or 4 * (x_max - x_min) < self.cached_x[-1] - self.cached_x[0]):
+            code = compile_function(func)
+            self.cached_function = None
+            if count != len(self.cached_x):
+                self.resize_buffers(count)
+            x = np.multiply(self.unit_grid, 2 * (x_max - x_min), out=self.cached_x)
+            x += x_min - (x_max - x_min) / 2
+            with np.errstate(all='ignore'):
+                np.copyto(self.cached_y, eval(code, FUNCTION_NAMESPACE, {'x': x}))
+                # The sum is only finite when every sample is, so clean functions skip the mask
+                if not np.isfinite(self.cached_y.sum()):
+                    np.isfinite(self.cached_y, out=self.cached_mask)
+                    np.copyto(self.cached_y, np.nan, where=~self.cached_mask)
+            self.cached_function = func
+        
+        start, stop = np.searchsorted(self.cached_x, (x_min, x_max))
+        start = max(start - 1, 0)
+        return self.cached_x[start:stop + 1], self.cached_y[start:stop + 1]
 
     def move_up(self):
-        self.y_min.set(self.y_min.get() + 10)
-        self.y_max.set(self.y_max.get() + 10)
-        self.plot()
+        if self.bounds_edited and not self.read_bounds():
+            return
+        self.bounds[2:] += MOVE_STEP
+        self.schedule_redraw()
 
     def move_down(self):
-        self.y_min.set(self.y_min.get() - 10)
-        self.y_max.set(self.y_max.get() - 10)
-        self.plot()
+        if self.bounds_edited and not self.read_bounds():
+            return
+        self.bounds[2:] -= MOVE_STEP
+        self.schedule_redraw()
 
     def move_left(self):
-        self.x_min.set(self.x_min.get() - 10)
-        self.x_max.set(self.x_max.get() - 10)
-        self.plot()
+        if self.bounds_edited and not self.read_bounds():
+            return
+        self.bounds[:2] -= MOVE_STEP
+        self.schedule_redraw()
 
     def move_right(self):
-        self.x_min.set(self.x_min.get() + 10)
-        self.x_max.set(self.x_max.get() + 10)
-        self.plot()
+        if self.bounds_edited and not self.read_bounds():
+            return
+        self.bounds[:2] += MOVE_STEP
+        self.schedule_redraw()
 
     def zoom_in(self):
-        if self.x_max.get() > 10:
-            self.x_min.set(self.x_min.get() + 10)
-            self.x_max.set(self.x_max.get() - 10)
-            self.y_min.set(self.y_min.get() + 10)
-            self.y_max.set(self.y_max.get() - 10)
-        self.plot()
+        edited = self.bounds_edited
+        if edited and not self.read_bounds():
+            return
+        x_min, x_max, y_min, y_max = self.bounds
+        if x_max - x_min > 2 * ZOOM_STEP and y_max - y_min > 2 * ZOOM_STEP:
+            self.bounds += ZOOM_IN_DELTA
+        elif not edited:
+            return
+        self.schedule_redraw()
 
     def zoom_out(self):
-        self.x_min.set(self.x_min.get() - 10)
-        self.x_max.set(self.x_max.get() + 10)
-        self.y_min.set(self.y_min.get() - 10)
-        self.y_max.set(self.y_max.get() + 10)
-        self.plot()
+        if self.bounds_edited and not self.read_bounds():
+            return
+        self.bounds -= ZOOM_IN_DELTA
+        self.schedule_redraw()
 
 if __name__ == '__main__':
     app = App()